@@ -21,7 +21,19 @@ class Settings(BaseSettings):
     whisper_model_size: str = Field(
         "small", description="Default Whisper model size identifier (tiny, base, small, medium, large)"
     )
+    whisper_beam_size: int = Field(
+        5,
+        description="Beam width for Whisper decoding; set 1 for greedy decoding, which is faster but may cost accuracy",
+    )
     sqlite_path: Path = Field(Path("data/tutor.db"), description="Path to SQLite database file")
+    srs_flush_interval: float = Field(
+        0.5,
+        description="Seconds to buffer spaced-repetition reviews before writing them in one batch (0 disables)",
+    )
+    preload_models: bool = Field(
+        False,
+        description="Load VAD, Whisper and TTS at startup instead of on the first request that needs them",
+    )
     enable_pitch_feedback: bool = Field(
         False,
         description="Whether to compute pitch contours for pronunciation feedback. Requires librosa and numpy",
@@ -32,6 +44,10 @@ class Settings(BaseSettings):
         0.35,
         description="Decision threshold (0-1) for VAD probability across WebRTC, Silero, or energy fallback",
     )
+    vad_silence_floor_dbfs: float = Field(
+        -50.0,
+        description="Buffers whose loudest 20 ms frame is below this level (dBFS) skip WebRTC/Silero as silence",
+    )
     # Conversational LLM configuration
     llm_model_name: str = Field(
         "TinyLlama/TinyLlama-1.1B-Chat-v1.0",
@@ -49,6 +65,14 @@ class Settings(BaseSettings):
         0.7,
         description="Sampling temperature applied during conversational generation",
     )
+    llm_quantize_int8: bool = Field(
+        False,
+        description="Use INT8 weights for the conversational model (dynamic quantization on CPU, bitsandbytes on CUDA)",
+    )
+    llm_backend: str = Field(
+        "torch",
+        description="Inference runtime for the conversational model (torch, or onnx for ONNX Runtime on CPU via optimum)",
+    )
     tts_model_name: str = Field(
         "facebook/mms-tts-lao",
         description="Hugging Face identifier for the Lao text-to-speech voice",
@@ -57,6 +81,21 @@ class Settings(BaseSettings):
         "cpu",
         description="Preferred device for TTS inference (cpu, cuda, mps)",
     )
+    tts_precision: str = Field(
+        "fp32",
+        description="Weight precision for TTS inference (fp32, bf16, fp16); fp16 falls back to bf16 on CPU",
+    )
+    tts_cache_size: int = Field(
+        256,
+        description="Number of synthesised clips kept in memory for repeated phrases (0 disables the cache)",
+    )
+    tts_compile: bool = Field(
+        False,
+        description=(
+            "Wrap the TTS model with torch.compile (dynamic shapes) and warm it up at startup; "
+            "slower boot, and the largest speed-up is on CUDA"
+        ),
+    )
 
     class Config:
         env_prefix = "LAO_TUTOR_"
@@ -1,7 +1,7 @@
 """FastAPI entrypoint for the Lao tutor backend."""
 from __future__ import annotations
 
-import base64
+import asyncio
 import logging
 from typing import Any, Optional
 
@@ -20,8 +20,9 @@ from .models.schemas import (
     UtteranceRequest,
     UtteranceResponse,
 )
+from .services.audio_codec import decode_pcm_base64
 from .services.tutor import TutorEngine
-from .services.llm import ConversationService
+from .services.llm import ConversationResult, ConversationService
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +30,8 @@ logging.basicConfig(level=logging.INFO)
 app = FastAPI(title="Lao Tutor API")
 settings = get_settings()
 tutor_engine = TutorEngine()
+if settings.preload_models:
+    tutor_engine.preload()
 conversation_service = ConversationService(tutor_engine.export_phrase_banks())
 
 app.add_middleware(
@@ -541,7 +544,11 @@ def index(request: Request) -> Response:
               for (let i = 0; i < binary.length; i += 1) {
                 bytes[i] = binary.charCodeAt(i);
               }
-              const floatView = new Float32Array(bytes.buffer);
+              const pcm = new Int16Array(bytes.buffer);
+              const floatView = new Float32Array(pcm.length);
+              for (let i = 0; i < pcm.length; i += 1) {
+                floatView[i] = pcm[i] / 32768;
+              }
               const audioBuffer = ctx.createBuffer(1, floatView.length, sampleRate);
               audioBuffer.copyToChannel(floatView, 0);
               const source = ctx.createBufferSource();
@@ -708,25 +715,18 @@ def index(request: Request) -> Response:
 def healthcheck() -> HealthResponse:
     return HealthResponse(
         status="ok",
-        whisper_loaded=tutor_engine.asr.is_ready,
-        vad_backend=tutor_engine.vad.backend_name,
-        tts_available=tutor_engine.tts.is_ready,
+        whisper_loaded=tutor_engine.asr_ready,
+        vad_backend=tutor_engine.vad_backend,
+        tts_available=tutor_engine.tts_ready,
         llm_available=conversation_service.is_ready,
     )
 
 
 def _decode_audio(audio_base64: str, expected_sample_rate: int) -> np.ndarray:
     try:
-        audio_bytes = base64.b64decode(audio_base64)
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Invalid base64 audio: {exc}") from exc
-    if len(audio_bytes) % 2 == 0:
-        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-    else:
-        audio = np.frombuffer(audio_bytes, dtype=np.float32)
-    if audio.size == 0:
-        raise HTTPException(status_code=400, detail="Empty audio payload")
-    return audio
+        return decode_pcm_base64(audio_base64)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @app.post("/api/v1/utterance", response_model=UtteranceResponse)
@@ -739,9 +739,9 @@ def handle_utterance(payload: UtteranceRequest) -> UtteranceResponse:
     teacher_audio_sample_rate = tts_result.sample_rate if tts_result else None
     debug_info: dict[str, Any] = {
         "task": tutor_engine.state.current_task,
-        "vad_backend": tutor_engine.vad.backend_name,
-        "asr_ready": tutor_engine.asr.is_ready,
-        "tts_ready": tutor_engine.tts.is_ready,
+        "vad_backend": tutor_engine.vad_backend,
+        "asr_ready": tutor_engine.asr_ready,
+        "tts_ready": tutor_engine.tts_ready,
     }
     return UtteranceResponse(
         feedback=feedback,
@@ -752,7 +752,7 @@ def handle_utterance(payload: UtteranceRequest) -> UtteranceResponse:
 
 
 @app.post("/api/v1/conversation", response_model=ConversationResponse)
-def handle_conversation(payload: ConversationRequest) -> ConversationResponse:
+async def handle_conversation(payload: ConversationRequest) -> ConversationResponse:
     history_payload = [message.dict() for message in payload.history]
 
     sample_rate = payload.sample_rate or settings.sample_rate
@@ -760,30 +760,44 @@ def handle_conversation(payload: ConversationRequest) -> ConversationResponse:
     heard_text: Optional[str] = None
 
     message_text = payload.message.strip() if payload.message else ""
-
-    if payload.audio_base64:
-        audio = _decode_audio(payload.audio_base64, sample_rate)
-        utterance_feedback = tutor_engine.process_audio(audio, sample_rate, payload.task_id)
+    audio = _decode_audio(payload.audio_base64, sample_rate) if payload.audio_base64 else None
+
+    async def generate_reply(text: str) -> ConversationResult:
+        try:
+            return await conversation_service.generate(history_payload, text, payload.task_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if audio is not None and message_text:
+        # A typed message drives the reply, so audio feedback can be computed alongside the LLM turn.
+        utterance_feedback, result = await asyncio.gather(
+            asyncio.to_thread(tutor_engine.process_audio, audio, sample_rate, payload.task_id),
+            generate_reply(message_text),
+        )
         heard_text = utterance_feedback.lao_text or None
-        if not message_text:
+    else:
+        if audio is not None:
+            utterance_feedback = await asyncio.to_thread(
+                tutor_engine.process_audio, audio, sample_rate, payload.task_id
+            )
+            heard_text = utterance_feedback.lao_text or None
             message_text = utterance_feedback.lao_text or utterance_feedback.romanised or ""
-        if not message_text and utterance_feedback.corrections:
-            message_text = utterance_feedback.corrections[0]
+            if not message_text and utterance_feedback.corrections:
+                message_text = utterance_feedback.corrections[0]
 
-    if not message_text.strip():
-        message_text = "I could not speak clearly."
+        if not message_text.strip():
+            message_text = "I could not speak clearly."
 
-    try:
-        result = conversation_service.generate(history_payload, message_text, payload.task_id)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        result = await generate_reply(message_text)
 
     tts_result = None
     spoken_text = result.spoken_text
     if spoken_text:
-        tts_result = tutor_engine.prepare_teacher_audio(text_override=spoken_text)
+        tts_result = await asyncio.to_thread(tutor_engine.prepare_teacher_audio, text_override=spoken_text)
     elif result.focus_phrase:
-        tts_result = tutor_engine.prepare_teacher_audio(text_override=result.focus_phrase)
+        tts_result = await asyncio.to_thread(
+            tutor_engine.prepare_teacher_audio, text_override=result.focus_phrase
+        )
 
     response_history = [ChatMessage(**entry) for entry in result.history]
     reply_message = ChatMessage(role="assistant", content=result.reply_text)
@@ -794,8 +808,8 @@ def handle_conversation(payload: ConversationRequest) -> ConversationResponse:
             {
                 "audio_processed": True,
                 "sample_rate": sample_rate,
-                "vad_backend": tutor_engine.vad.backend_name,
-                "asr_ready": tutor_engine.asr.is_ready,
+                "vad_backend": tutor_engine.vad_backend,
+                "asr_ready": tutor_engine.asr_ready,
             }
         )
     else:
@@ -30,7 +30,7 @@ class UtteranceResponse(BaseModel):
 
     feedback: SegmentFeedback
     teacher_audio_base64: Optional[str] = Field(
-        None, description="Base64 encoded PCM audio of the teacher response"
+        None, description="Base64 encoded 16-bit PCM audio of the teacher response"
     )
     teacher_audio_sample_rate: Optional[int] = Field(
         None, description="Sample rate in Hz for the teacher audio clip"
@@ -97,7 +97,7 @@ class ConversationResponse(BaseModel):
         default=None, description="Detailed feedback derived from the learner's spoken audio"
     )
     teacher_audio_base64: Optional[str] = Field(
-        default=None, description="Optional teacher audio clip encoded as base64 float32 PCM"
+        default=None, description="Optional teacher audio clip encoded as base64 16-bit PCM"
     )
     teacher_audio_sample_rate: Optional[int] = Field(
         default=None, description="Sample rate corresponding to the teacher audio clip"
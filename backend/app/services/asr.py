@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
@@ -37,6 +38,7 @@ class AsrService:
     def __init__(self, model_size: Optional[str] = None, device: str = "auto") -> None:
         settings = get_settings()
         self.model_size = model_size or settings.whisper_model_size
+        self.beam_size = max(1, settings.whisper_beam_size)
         self.device = device
         self._model: Optional[WhisperModel] = None  # type: ignore[assignment]
 
@@ -66,7 +68,7 @@ class AsrService:
 
         segments, info = self._model.transcribe(
             audio=audio,
-            beam_size=5,
+            beam_size=self.beam_size,
             language="lo",
             temperature=0.0,
         )
@@ -74,4 +76,11 @@ class AsrService:
         return AsrResult(text=text.strip(), language=info.language, confidence=info.language_probability)
 
 
-__all__ = ["AsrService", "AsrResult"]
+@lru_cache(maxsize=1)
+def get_asr_service() -> AsrService:
+    """Return the process-wide Whisper service so model weights load only once."""
+
+    return AsrService()
+
+
+__all__ = ["AsrService", "AsrResult", "get_asr_service"]
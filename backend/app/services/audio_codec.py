@@ -0,0 +1,31 @@
+"""Decoding helpers for learner audio sent over the API."""
+from __future__ import annotations
+
+import base64
+import binascii
+
+import numpy as np
+
+_PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def decode_pcm_base64(audio_base64: str) -> np.ndarray:
+    """Decode base64 PCM into a float32 buffer in [-1, 1).
+
+    Payloads are little-endian 16-bit PCM. Raises ``ValueError`` for invalid base64 or an
+    empty or odd-length payload.
+    """
+
+    try:
+        raw = base64.b64decode(audio_base64)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError(f"Invalid base64 audio: {exc}") from exc
+    if not raw:
+        raise ValueError("Empty audio payload")
+    if len(raw) % 2:
+        raise ValueError("PCM16 payload must have an even byte length")
+    # Widen and scale in one ufunc pass straight into the float32 result.
+    return np.multiply(np.frombuffer(raw, dtype="<i2"), _PCM16_SCALE, dtype=np.float32)
+
+
+__all__ = ["decode_pcm_base64"]
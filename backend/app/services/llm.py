@@ -1,22 +1,29 @@
 """Conversational LLM orchestration for the Lao tutor."""
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
+import threading
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Deque, Dict, List, Mapping, Optional, Tuple, Union
 
 from ..config import get_settings
+from .nlp import extract_first_lao_line
 
 logger = logging.getLogger(__name__)
 
 try:  # pragma: no cover - optional dependency path
-    from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline  # type: ignore
+    from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig  # type: ignore
 
     _TRANSFORMERS_AVAILABLE = True
 except Exception:  # pragma: no cover - optional dependency path
     AutoModelForCausalLM = None  # type: ignore
     AutoTokenizer = None  # type: ignore
-    pipeline = None  # type: ignore
+    BitsAndBytesConfig = None  # type: ignore
     _TRANSFORMERS_AVAILABLE = False
 
 try:  # pragma: no cover - optional dependency path
@@ -28,7 +35,15 @@ except Exception:  # pragma: no cover - optional dependency path
     _TORCH_AVAILABLE = False
 
 
-ChatHistory = List[Dict[str, str]]
+ChatTurn = Dict[str, str]
+ChatHistory = Union[List[ChatTurn], Deque[ChatTurn]]
+
+# Prior turns kept as prompt context; the returned history also holds the new user/assistant pair.
+_HISTORY_WINDOW = 8
+
+# Lines after the first are encoded as anchor + "\n" + line and the anchor's ids dropped, so each
+# line's leading newline tokenizes as it does inside the joined prompt (no SentencePiece "▁" prefix).
+_LINE_ANCHOR = "a"
 
 
 @dataclass
@@ -51,82 +66,181 @@ class ConversationService:
         "and an English gloss when presenting phrases. Encourage the learner to repeat the Lao focus phrase."
     )
 
-    def __init__(self, phrase_bank: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+    def __init__(self, phrase_bank: Optional[Mapping[str, Mapping[str, str]]] = None) -> None:
         settings = get_settings()
         self._phrase_bank = phrase_bank or {}
+        # The focus phrase is each task's first entry; unknown tasks use the first bank's.
+        self._focus_by_task: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+            task: next(iter(bank.items()), (None, None)) for task, bank in self._phrase_bank.items()
+        }
+        self._default_focus = next(iter(self._focus_by_task.values()), (None, None))
         self._model_name = settings.llm_model_name
         self._temperature = settings.llm_temperature
         self._max_new_tokens = settings.llm_max_new_tokens
         self._device = settings.llm_device
-        self._generator = None
+        self._model = None
         self._tokenizer = None
+        self._torch_device = None
+        self._pad_token_id: Optional[int] = None
+        self._system_ids: Tuple[int, ...] = ()
+        self._anchor_len = 0
+        self._per_line_ids = False
+        # Chat turns are re-sent with every request, so each line is tokenized once and reused.
+        self._encode_line = lru_cache(maxsize=512)(self._encode_text)
+
+        # The model is the largest in the process and only this endpoint uses it, so it is
+        # loaded on the first conversation turn rather than at startup.
+        self._load_lock = threading.Lock()
+        self._load_attempted = not (_TRANSFORMERS_AVAILABLE and _TORCH_AVAILABLE)
+        if self._load_attempted:
+            logger.warning("Transformers/torch unavailable; using scripted conversation fallback")
 
-        if _TRANSFORMERS_AVAILABLE and _TORCH_AVAILABLE:
-            try:
-                self._tokenizer = AutoTokenizer.from_pretrained(
-                    self._model_name, cache_dir=settings.model_dir
-                )
-                model = AutoModelForCausalLM.from_pretrained(
+    def _ensure_loaded(self) -> bool:
+        if not self._load_attempted:
+            with self._load_lock:
+                if not self._load_attempted:
+                    self._load(get_settings())
+                    self._load_attempted = True
+        return self._model is not None
+
+    def _load(self, settings) -> None:  # pragma: no cover - requires transformers runtime
+        try:
+            self._tokenizer = AutoTokenizer.from_pretrained(self._model_name, cache_dir=settings.model_dir)
+            self._pad_token_id = self._tokenizer.eos_token_id
+            bos = self._tokenizer.bos_token_id
+            self._system_ids = ((bos,) if bos is not None else ()) + tuple(
+                self._tokenizer(f"System: {self._SYSTEM_PROMPT}", add_special_tokens=False).input_ids
+            )
+            self._anchor_len = len(self._tokenizer(_LINE_ANCHOR, add_special_tokens=False).input_ids)
+            self._per_line_ids = self._line_ids_match_joined()
+            if not self._per_line_ids:
+                logger.info("Tokenizer merges across prompt lines; encoding the joined prompt per request")
+            self._torch_device = self._resolve_device()
+            self._model = self._load_model(settings)
+            self._torch_device = self._model.device
+            # Reuse past key/values between decode steps even if the checkpoint config disables it.
+            self._model.config.use_cache = True
+            if hasattr(self._model, "eval"):  # ONNX Runtime models are not nn.Modules
+                self._model.eval()
+            logger.info("Loaded conversational model %s on %s", self._model_name, self._torch_device)
+        except Exception as exc:  # pragma: no cover - optional failure path
+            self._model = None
+            logger.warning("Conversation model unavailable (%s); falling back to scripted replies", exc)
+
+    def _load_model(self, settings):  # pragma: no cover - requires transformers runtime
+        if settings.llm_backend.lower() == "onnx":
+            model = self._load_onnx_model(settings)
+            if model is not None:
+                return model
+        quantize = settings.llm_quantize_int8
+        if quantize and self._torch_device.type == "cuda":
+            if importlib.util.find_spec("bitsandbytes") is not None:
+                return AutoModelForCausalLM.from_pretrained(
                     self._model_name,
                     cache_dir=settings.model_dir,
+                    quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                    device_map="auto",
                 )
-                device = 0 if self._device.startswith("cuda") else (0 if self._device == "mps" else -1)
-                self._generator = pipeline(
-                    "text-generation",
-                    model=model,
-                    tokenizer=self._tokenizer,
-                    device=device,
-                )
-                logger.info("Loaded conversational model %s", self._model_name)
-            except Exception as exc:  # pragma: no cover - optional failure path
-                logger.warning("Conversation model unavailable (%s); falling back to scripted replies", exc)
-        else:
-            logger.warning("Transformers/torch unavailable; using scripted conversation fallback")
+            logger.warning("bitsandbytes not installed; loading conversation model without INT8 weights")
+        model = AutoModelForCausalLM.from_pretrained(
+            self._model_name,
+            cache_dir=settings.model_dir,
+            low_cpu_mem_usage=importlib.util.find_spec("accelerate") is not None,
+        )
+        if quantize and self._torch_device.type == "cpu":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model.to(self._torch_device)
+
+    def _load_onnx_model(self, settings):  # pragma: no cover - requires optimum runtime
+        if self._torch_device.type != "cpu":
+            logger.warning("ONNX Runtime backend only targets CPU; using torch on %s", self._torch_device)
+            return None
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM  # type: ignore
+        except Exception:
+            logger.warning("optimum[onnxruntime] not installed; using torch for the conversation model")
+            return None
+        return ORTModelForCausalLM.from_pretrained(
+            self._model_name,
+            cache_dir=settings.model_dir,
+            export=True,
+            provider="CPUExecutionProvider",
+        )
+
+    def _resolve_device(self):  # pragma: no cover - trivial helper
+        target = (self._device or "cpu").lower()
+        if target.startswith("cuda") and torch.cuda.is_available():  # type: ignore[union-attr]
+            return torch.device(target)  # type: ignore[union-attr]
+        if target == "mps" and hasattr(torch.backends, "mps") and torch.backends.mps.is_available():  # type: ignore[union-attr]
+            return torch.device("mps")  # type: ignore[union-attr]
+        return torch.device("cpu")  # type: ignore[union-attr]
 
     @property
     def is_ready(self) -> bool:
-        return self._generator is not None
+        """True once the model is loaded, or while it can still be loaded on first use."""
 
-    def _select_focus_phrase(self, task_id: Optional[str]) -> tuple[Optional[str], Optional[str]]:
-        if task_id and task_id in self._phrase_bank:
-            bank = self._phrase_bank[task_id]
-        else:
-            bank = next(iter(self._phrase_bank.values()), {})
-        if not bank:
-            return None, None
-        phrase, translation = next(iter(bank.items()))
-        return phrase, translation
+        return self._model is not None or not self._load_attempted
 
-    def _format_prompt(
+    def _select_focus_phrase(self, task_id: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+        if task_id and task_id in self._focus_by_task:
+            return self._focus_by_task[task_id]
+        return self._default_focus
+
+    def _encode_text(self, line: str) -> Tuple[int, ...]:
+        ids = self._tokenizer(f"{_LINE_ANCHOR}\n{line}", add_special_tokens=False).input_ids  # type: ignore[misc]
+        return tuple(ids[self._anchor_len :])
+
+    def _line_ids_match_joined(self) -> bool:
+        """Check that per-line ids reproduce tokenizing the joined prompt with this tokenizer."""
+
+        history = [
+            {"role": "user", "content": "ສະບາຍດີ"},
+            {"role": "assistant", "content": "Great! Say ຂອບໃຈ next."},
+        ]
+        lines = self._prompt_lines(history, "How do I count?", "ສອງ", "2")
+        self._per_line_ids = True
+        try:
+            per_line = self._build_prompt_ids(history, "How do I count?", "ສອງ", "2")
+        finally:
+            self._per_line_ids = False
+            self._encode_line.cache_clear()
+        return per_line == list(self._tokenizer("\n".join(lines)).input_ids)  # type: ignore[misc]
+
+    def _prompt_lines(
         self, history: ChatHistory, user_message: str, focus_phrase: Optional[str], focus_translation: Optional[str]
-    ) -> str:
-        conversation: ChatHistory = []
-        for message in history[-8:]:
-            if message.get("role") in {"user", "assistant"} and message.get("content"):
-                conversation.append({"role": message["role"], "content": message["content"]})
-        conversation.append({"role": "user", "content": user_message})
-
-        prompt_parts = [f"System: {self._SYSTEM_PROMPT}"]
+    ) -> List[str]:
+        lines = [f"System: {self._SYSTEM_PROMPT}"]
         if focus_phrase:
-            prompt_parts.append(
+            lines.append(
                 "System: Today's focus phrase is '"
                 f"{focus_phrase}' which means '{focus_translation or '...'}'."
             )
-        for item in conversation:
-            role = item["role"].capitalize()
-            prompt_parts.append(f"{role}: {item['content']}")
-        prompt_parts.append("Assistant:")
-        return "\n".join(prompt_parts)
+        for message in islice(history, max(len(history) - _HISTORY_WINDOW, 0), None):
+            role = message.get("role")
+            content = message.get("content")
+            if role in {"user", "assistant"} and content:
+                lines.append(f"{role.capitalize()}: {content}")
+        lines.append(f"User: {user_message}")
+        lines.append("Assistant:")
+        return lines
+
+    def _build_prompt_ids(
+        self, history: ChatHistory, user_message: str, focus_phrase: Optional[str], focus_translation: Optional[str]
+    ) -> List[int]:
+        """Assemble the prompt from per-line token ids so only new lines hit the tokenizer."""
+
+        lines = self._prompt_lines(history, user_message, focus_phrase, focus_translation)
+        if not self._per_line_ids:
+            return list(self._tokenizer("\n".join(lines)).input_ids)  # type: ignore[misc]
+        prompt_ids = list(self._system_ids)
+        for line in islice(lines, 1, None):
+            prompt_ids.extend(self._encode_line(line))
+        return prompt_ids
 
     @staticmethod
     def _extract_lao_line(text: str) -> Optional[str]:
-        for line in text.splitlines():
-            candidate = line.strip()
-            if not candidate:
-                continue
-            if any("຀" <= char <= "໿" for char in candidate):
-                return candidate
-        return None
+        # One compiled scan locates the first Lao character; only that line is sliced out.
+        return extract_first_lao_line(text)
 
     def _fallback_reply(
         self, user_message: str, focus_phrase: Optional[str], focus_translation: Optional[str]
@@ -144,9 +258,25 @@ class ConversationService:
         )
         return reply, focus_phrase
 
-    def generate(
+    def _run_generator(self, prompt_ids: List[int]) -> str:
+        input_ids = torch.tensor([prompt_ids], device=self._torch_device)  # type: ignore[union-attr]
+        with torch.inference_mode():  # type: ignore[union-attr]
+            output_ids = self._model.generate(  # type: ignore[union-attr]
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),  # type: ignore[union-attr]
+                max_new_tokens=self._max_new_tokens,
+                temperature=self._temperature,
+                pad_token_id=self._pad_token_id,
+                use_cache=True,
+            )
+        new_tokens = output_ids[0, input_ids.shape[1] :]
+        return self._tokenizer.decode(new_tokens, skip_special_tokens=True).strip()  # type: ignore[union-attr]
+
+    async def generate(
         self, history: ChatHistory, user_message: str, task_id: Optional[str] = None
     ) -> ConversationResult:
+        """Produce the tutor's next turn, running model inference off the event loop."""
+
         if not user_message.strip():
             raise ValueError("Message must not be empty")
 
@@ -154,17 +284,15 @@ class ConversationService:
 
         spoken_text: Optional[str] = None
 
-        if self._generator and self._tokenizer:
-            prompt = self._format_prompt(history, user_message, focus_phrase, focus_translation)
+        if not self._load_attempted:
+            await asyncio.to_thread(self._ensure_loaded)
+
+        if self._model is not None and self._tokenizer is not None:
             try:
-                outputs = self._generator(
-                    prompt,
-                    max_new_tokens=self._max_new_tokens,
-                    temperature=self._temperature,
-                    pad_token_id=self._tokenizer.eos_token_id,
-                )
-                generated = outputs[0]["generated_text"]
-                reply = generated[len(prompt) :].strip() or generated.strip()
+                prompt_ids = self._build_prompt_ids(history, user_message, focus_phrase, focus_translation)
+                reply = await asyncio.to_thread(self._run_generator, prompt_ids)
+                if not reply:
+                    raise RuntimeError("model returned an empty reply")
                 spoken_text = self._extract_lao_line(reply)
             except Exception as exc:  # pragma: no cover - runtime safety
                 logger.warning("Generation failed (%s); using fallback response", exc)
@@ -181,7 +309,7 @@ class ConversationService:
         if not spoken_text:
             spoken_text = focus_phrase or None
 
-        updated_history = history[-8:].copy()
+        updated_history: Deque[ChatTurn] = deque(history, maxlen=_HISTORY_WINDOW + 2)
         updated_history.append({"role": "user", "content": user_message})
         updated_history.append({"role": "assistant", "content": reply})
 
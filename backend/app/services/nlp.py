@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import logging
+import re
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,27 @@ _ROMAN_MAP = {
     "ເ": "e", "ແ": "ae", "ໂ": "o", "ໄ": "ai", "ໃ": "ai", "ັ": "a",
 }
 
+# Lao Unicode block (U+0E80–U+0EFF). A compiled search beats per-character range or
+# frozenset checks for the short ASR/LLM lines this is applied to.
+_LAO_CHAR_RE = re.compile("[\u0e80-\u0eff]")
+
+
+def contains_lao_characters(text: str) -> bool:
+    """Return True when ``text`` contains at least one Lao script character."""
+
+    return _LAO_CHAR_RE.search(text) is not None
+
+
+def extract_first_lao_line(text: str) -> Optional[str]:
+    """Return the first line of ``text`` that contains Lao script, stripped, or None."""
+
+    match = _LAO_CHAR_RE.search(text)
+    if match is None:
+        return None
+    start = text.rfind("\n", 0, match.start()) + 1
+    end = text.find("\n", match.end())
+    return text[start : end if end != -1 else None].strip()
+
 
 @dataclass
 class SegmentedText:
@@ -56,4 +78,4 @@ class LaoTextProcessor:
         return "".join(roman_chars)
 
 
-__all__ = ["LaoTextProcessor", "SegmentedText"]
+__all__ = ["LaoTextProcessor", "SegmentedText", "contains_lao_characters", "extract_first_lao_line"]
@@ -1,11 +1,15 @@
 """Spaced repetition scheduling utilities."""
 from __future__ import annotations
 
+import atexit
+import calendar
 import datetime as dt
 import logging
+import threading
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional, Tuple
 
 import sqlite3
 
@@ -28,10 +32,63 @@ CREATE TABLE IF NOT EXISTS reviews (
     reviewed_at TEXT NOT NULL,
     ease REAL NOT NULL,
     interval INTEGER NOT NULL,
-    next_due TEXT NOT NULL
+    next_due INTEGER NOT NULL
 );
 """
 
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_reviews_next_due ON reviews(next_due, card_id);
+"""
+
+# Databases created before next_due moved to epoch seconds declare the column TEXT. SQLite
+# cannot change a column's type in place, so the table is rebuilt once with an INTEGER
+# column and the ISO-8601 values converted on the way across.
+MIGRATE_NEXT_DUE_SQL = """
+BEGIN;
+CREATE TABLE reviews_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id TEXT NOT NULL REFERENCES cards(id) ON DELETE CASCADE,
+    reviewed_at TEXT NOT NULL,
+    ease REAL NOT NULL,
+    interval INTEGER NOT NULL,
+    next_due INTEGER NOT NULL
+);
+INSERT INTO reviews_new(id, card_id, reviewed_at, ease, interval, next_due)
+SELECT id, card_id, reviewed_at, ease, interval,
+    CASE
+        WHEN next_due LIKE '____-__-__%' THEN CAST(strftime('%s', next_due) AS INTEGER)
+        ELSE CAST(next_due AS INTEGER)
+    END
+FROM reviews;
+DROP TABLE reviews;
+ALTER TABLE reviews_new RENAME TO reviews;
+COMMIT;
+"""
+
+INSERT_REVIEW_SQL = """
+INSERT INTO reviews(card_id, reviewed_at, ease, interval, next_due)
+VALUES(?, ?, ?, ?, ?)
+"""
+
+ReviewRow = Tuple[str, str, float, int, int]
+
+
+# Live repositories, flushed once at interpreter exit. Held weakly so the atexit table does not keep
+# every repository alive; a repository with pending rows stays referenced by its flush timer.
+_LIVE_REPOSITORIES: "weakref.WeakSet[SrsRepository]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_repositories() -> None:
+    for repo in list(_LIVE_REPOSITORIES):
+        repo.flush()
+
+
+def _to_epoch(moment: dt.datetime) -> int:
+    """Convert a naive UTC datetime to integer seconds since the epoch."""
+
+    return calendar.timegm(moment.utctimetuple())
+
 
 @dataclass
 class ReviewLog:
@@ -43,11 +100,25 @@ class ReviewLog:
 
 
 class SrsRepository:
-    """Simple SM-2 style scheduler backed by SQLite."""
+    """Simple SM-2 style scheduler backed by SQLite.
+
+    Reviews are buffered in memory and written in batches, either ``flush_interval``
+    seconds after the first pending review or once ``max_pending`` accumulate. Losing
+    the last fraction of a second of taps on a crash is acceptable for a learning app;
+    an interval of zero or less writes every review immediately.
+    """
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(self, db_path: Path, flush_interval: float = 0.5, max_pending: int = 64) -> None:
         self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[ReviewRow] = []
+        self._lock = threading.Lock()
+        # Held across swap-and-commit so a concurrent flush waits for an in-flight batch.
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
         self._ensure_schema()
+        _LIVE_REPOSITORIES.add(self)
 
     def _connect(self) -> sqlite3.Connection:
         return sqlite3.connect(self.db_path)
@@ -55,9 +126,20 @@ class SrsRepository:
     def _ensure_schema(self) -> None:
         with self._connect() as conn:
             conn.executescript(SCHEMA_SQL)
+            if self._next_due_is_text(conn):
+                conn.executescript(MIGRATE_NEXT_DUE_SQL)
+                logger.info("Migrated reviews.next_due to epoch seconds at %s", self.db_path)
+            conn.executescript(INDEX_SQL)
             conn.commit()
         logger.debug("Ensured SRS schema at %s", self.db_path)
 
+    @staticmethod
+    def _next_due_is_text(conn: sqlite3.Connection) -> bool:
+        for _cid, name, col_type, *_rest in conn.execute("PRAGMA table_info(reviews)"):
+            if name == "next_due":
+                return col_type.upper() != "INTEGER"
+        return False
+
     def upsert_card(
         self,
         card_id: str,
@@ -89,20 +171,46 @@ class SrsRepository:
             prev_interval = 1
         interval = max(1, int(prev_interval * (1 + ease)))
         next_due = now + dt.timedelta(days=interval)
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO reviews(card_id, reviewed_at, ease, interval, next_due)
-                VALUES(?, ?, ?, ?, ?)
-                """,
-                (card_id, now.isoformat(), ease, interval, next_due.isoformat()),
-            )
-            conn.commit()
+        row: ReviewRow = (card_id, now.isoformat(), ease, interval, _to_epoch(next_due))
+        flush_now = self.flush_interval <= 0
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.max_pending:
+                flush_now = True
+            elif not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if flush_now:
+            self.flush()
         logger.debug("Logged review for %s with interval %s", card_id, interval)
         return ReviewLog(card_id=card_id, reviewed_at=now, ease=ease, interval=interval, next_due=next_due)
 
+    def flush(self) -> None:
+        """Write any buffered reviews to SQLite in a single transaction."""
+
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not pending:
+                return
+            try:
+                with self._connect() as conn:
+                    conn.executemany(INSERT_REVIEW_SQL, pending)
+                    conn.commit()
+            except sqlite3.Error as exc:
+                logger.warning("Failed to flush %d buffered reviews (%s); will retry", len(pending), exc)
+                with self._lock:
+                    self._pending[:0] = pending
+                return
+        logger.debug("Flushed %d buffered reviews", len(pending))
+
     def due_cards(self, limit: int = 10) -> Iterable[str]:
-        today = dt.datetime.utcnow().isoformat()
+        self.flush()
+        now = _to_epoch(dt.datetime.utcnow())
         with self._connect() as conn:
             cursor = conn.execute(
                 """
@@ -111,7 +219,7 @@ class SrsRepository:
                 ORDER BY next_due ASC
                 LIMIT ?
                 """,
-                (today, limit),
+                (now, limit),
             )
             rows = cursor.fetchall()
         return [row[0] for row in rows]
@@ -2,9 +2,13 @@
 from __future__ import annotations
 
 import base64
+import importlib.util
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 import numpy as np
 
@@ -21,6 +25,9 @@ except Exception:  # pragma: no cover - optional dependency
     VitsModel = None  # type: ignore
     _TRANSFORMERS_AVAILABLE = False
 
+# low_cpu_mem_usage loading is implemented by accelerate, which only the llm extra installs.
+_ACCELERATE_AVAILABLE = importlib.util.find_spec("accelerate") is not None
+
 try:  # pragma: no cover - optional dependency
     import torch  # type: ignore
 
@@ -30,10 +37,14 @@ except Exception:  # pragma: no cover - optional dependency
     _TORCH_AVAILABLE = False
 
 
+_WARMUP_TEXT = "ສະບາຍດີ"
+
+
 @dataclass
 class TtsResult:
     audio_base64: str
     sample_rate: int
+    encoding: str = "pcm_s16le"
 
 
 class TtsService:
@@ -50,20 +61,39 @@ class TtsService:
         else:
             self._device = settings.tts_device
         self._torch_device = None
+        self._precision = settings.tts_precision.lower()
+        self._dtype = None
+        # Drills replay the same focus phrases, so finished clips are kept in a small LRU.
+        self._cache: "OrderedDict[str, TtsResult]" = OrderedDict()
+        self._cache_size = max(0, settings.tts_cache_size)
+        self._cache_lock = threading.Lock()
+        self._inference_lock = threading.Lock()
+        self._pinned = None
+        self._pinned_lock = threading.Lock()
 
         if _TRANSFORMERS_AVAILABLE and _TORCH_AVAILABLE:
             try:
                 self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=settings.model_dir)
+                self._torch_device = self._resolve_device()
+                self._dtype = self._resolve_dtype()
+                # Load straight into the target dtype without a second full fp32 copy in RAM.
                 self._model = VitsModel.from_pretrained(
                     self.model_name,
                     cache_dir=settings.model_dir,
+                    torch_dtype=self._dtype,
+                    low_cpu_mem_usage=_ACCELERATE_AVAILABLE,
                 )
-                self._torch_device = self._resolve_device()
                 if self._torch_device:
-                    self._model = self._model.to(self._torch_device)
-                logger.info("Loaded TTS model %s on %s", self.model_name, self._torch_device or "cpu")
+                    self._model = self._model.to(self._torch_device, dtype=self._dtype)
+                logger.info(
+                    "Loaded TTS model %s on %s (%s)", self.model_name, self._torch_device or "cpu", self._dtype
+                )
             except Exception as exc:  # pragma: no cover - best-effort load
                 logger.warning("Could not load TTS model: %s", exc)
+            if self._model is not None and settings.tts_compile:
+                self._compile_model()
+            elif self._model is not None:
+                self._warm_up()
         else:
             logger.warning("Transformers or torch unavailable; TTS will emit placeholders")
 
@@ -75,23 +105,127 @@ class TtsService:
             return torch.device("mps")  # type: ignore[call-arg]
         return torch.device("cpu")  # type: ignore[call-arg]
 
+    def _resolve_dtype(self):  # pragma: no cover - trivial helper
+        if self._precision == "bf16":
+            return torch.bfloat16  # type: ignore[union-attr]
+        if self._precision == "fp16":
+            # CPU half-precision convolutions are poorly supported; bf16 is the CPU equivalent.
+            if self._torch_device is not None and self._torch_device.type == "cpu":
+                return torch.bfloat16  # type: ignore[union-attr]
+            return torch.float16  # type: ignore[union-attr]
+        if self._precision != "fp32":
+            logger.warning("Unknown TTS precision %r; using fp32", self._precision)
+        return torch.float32  # type: ignore[union-attr]
+
+    def _compile_model(self) -> None:  # pragma: no cover - requires torch runtime
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile unavailable in this torch build; using eager TTS")
+            return
+        eager_model = self._model
+        try:
+            # CUDA graphs ("reduce-overhead") only help on GPU; input lengths vary per phrase,
+            # so compile dynamically instead of specialising on the warm-up shape.
+            mode = "reduce-overhead" if self._torch_device.type == "cuda" else "default"
+            self._model = torch.compile(self._model, mode=mode, dynamic=True)  # type: ignore[union-attr]
+            # Compilation is lazy; pay it here rather than on the first learner request.
+            self.synthesize(_WARMUP_TEXT)
+            logger.info("Compiled TTS model %s", self.model_name)
+        except Exception as exc:
+            logger.warning("torch.compile failed for TTS (%s); using eager model", exc)
+            self._model = eager_model
+
+    def _warm_up(self) -> None:  # pragma: no cover - requires torch runtime
+        # The first forward pass pays kernel selection and device context setup; do it at boot.
+        try:
+            self.synthesize(_WARMUP_TEXT)
+        except Exception as exc:
+            logger.warning("TTS warm-up failed: %s", exc)
+
     @property
     def is_ready(self) -> bool:
         return self._model is not None and self._tokenizer is not None
 
     def synthesize(self, text: str) -> Optional[TtsResult]:
+        return self.synthesize_batch([text])[0]
+
+    def synthesize_batch(self, texts: List[str]) -> List[Optional[TtsResult]]:
+        """Synthesise several clips, running all uncached texts through VITS as one padded batch."""
+
         if not self.is_ready:
-            logger.debug("Returning placeholder TTS for text: %s", text)
-            return None
-        inputs = self._tokenizer(text, return_tensors="pt")  # type: ignore[operator]
+            logger.debug("Returning placeholder TTS for texts: %s", texts)
+            return [None] * len(texts)
+        keys = [text.strip() for text in texts]
+        results: Dict[str, TtsResult] = {}
+        with self._cache_lock:
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[key] = cached
+        missing = list(dict.fromkeys(key for key in keys if key not in results))
+        if missing:
+            fresh = self._synthesize_uncached(missing)
+            results.update(zip(missing, fresh))
+            if self._cache_size:
+                with self._cache_lock:
+                    for key, result in zip(missing, fresh):
+                        self._cache[key] = result
+                        self._cache.move_to_end(key)
+                    while len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+        return [results[key] for key in keys]
+
+    def _synthesize_uncached(self, texts: List[str]) -> List[TtsResult]:
+        inputs = self._tokenizer(texts, return_tensors="pt", padding=True)  # type: ignore[operator]
         if self._torch_device:
             inputs = {key: value.to(self._torch_device) for key, value in inputs.items()}
-        with torch.no_grad():  # type: ignore[operator]
-            waveform = self._model(**inputs).waveform  # type: ignore[operator]
-        audio = waveform.squeeze().detach().cpu().numpy().astype(np.float32)
-        audio_base64 = base64.b64encode(audio.tobytes()).decode("utf-8")
+        # Requests reach here from several worker threads; one forward pass at a time avoids
+        # threads thrashing the device (or CPU intra-op pool) while encoding stays concurrent.
+        with self._inference_lock, torch.inference_mode():  # type: ignore[union-attr]
+            output = self._model(**inputs)  # type: ignore[operator]
+        audio_i16 = self._to_pcm16(output.waveform)
+        # Padded rows run past the end of their utterance; VITS reports each row's real length.
+        lengths = getattr(output, "sequence_lengths", None)
+        lengths = lengths.tolist() if lengths is not None else [audio_i16.shape[-1]] * len(texts)
         sample_rate = int(getattr(self._model.config, "sampling_rate", 16000))  # type: ignore[union-attr]
-        return TtsResult(audio_base64=audio_base64, sample_rate=sample_rate)
-
-
-__all__ = ["TtsService", "TtsResult"]
\ No newline at end of file
+        return [
+            TtsResult(
+                audio_base64=base64.b64encode(memoryview(audio_i16[row, :length]).cast("B")).decode("utf-8"),
+                sample_rate=sample_rate,
+            )
+            for row, length in enumerate(lengths)
+        ]
+
+    def _to_pcm16(self, waveform) -> np.ndarray:  # pragma: no cover - requires torch runtime
+        """Return the ``(batch, samples)`` waveform as a host int16 array."""
+
+        waveform = waveform.detach().reshape(-1, waveform.shape[-1])
+        flat = waveform.reshape(-1)
+        if flat.device.type != "cuda":
+            # One fused cast+copy to host float32 (a no-op view for fp32 CPU runs).
+            return _float_to_pcm16(waveform.to("cpu", dtype=torch.float32).numpy())  # type: ignore[union-attr]
+        # Copy through a reused page-locked buffer so the transfer is a direct DMA
+        # rather than a copy staged through pageable memory.
+        with self._pinned_lock:
+            size = flat.numel()
+            if self._pinned is None or self._pinned.numel() < size:
+                self._pinned = torch.empty(size, dtype=torch.float32, pin_memory=True)  # type: ignore[union-attr]
+            host = self._pinned[:size]
+            host.copy_(flat, non_blocking=True)
+            torch.cuda.current_stream(flat.device).synchronize()  # type: ignore[union-attr]
+            return _float_to_pcm16(host.numpy()).reshape(tuple(waveform.shape))
+
+
+def _float_to_pcm16(audio: np.ndarray) -> np.ndarray:
+    # 16-bit PCM is plenty for speech and halves the payload versus float32.
+    return np.clip(audio * 32767.0, -32768, 32767).astype("<i2")
+
+
+@lru_cache(maxsize=1)
+def get_tts_service() -> TtsService:
+    """Return the process-wide TTS service so model weights load only once."""
+
+    return TtsService()
+
+
+__all__ = ["TtsService", "TtsResult", "get_tts_service"]
\ No newline at end of file
@@ -3,23 +3,29 @@ from __future__ import annotations
 
 import base64
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 import numpy as np
 
 from ..config import get_settings
 from ..models.schemas import SegmentFeedback
-from .asr import AsrService
-from .nlp import LaoTextProcessor
+from .asr import AsrService, get_asr_service
+from .nlp import LaoTextProcessor, SegmentedText
 from .srs import SrsRepository
-from .tts import TtsResult, TtsService
+from .tts import TtsResult, TtsService, get_tts_service
 from .vad import VoiceActivityDetector
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_BANK: Mapping[str, str] = MappingProxyType({})
 
-@dataclass
+
+@dataclass(slots=True)
 class TutorState:
     current_task: str = "day1_greetings"
     turn_count: int = 0
@@ -28,15 +34,108 @@ class TutorState:
 class TutorEngine:
     """High-level orchestration of the Lao tutor."""
 
-    def __init__(self) -> None:
+    __slots__ = (
+        "_vad",
+        "_asr",
+        "_tts",
+        "_service_lock",
+        "text_processor",
+        "_segment_cache",
+        "srs",
+        "state",
+        "_phrase_bank",
+        "_phrase_bank_view",
+        "_current_bank",
+        "_first_phrase",
+    )
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
         settings = get_settings()
-        self.vad = VoiceActivityDetector(sample_rate=settings.sample_rate, threshold=settings.vad_threshold)
-        self.asr = AsrService()
-        self.tts = TtsService(settings.tts_model_name, settings.tts_device)
+        # VAD (Silero), Whisper and VITS load on first use, so phrase-bank-only callers never pay for them.
+        self._vad: Optional[VoiceActivityDetector] = None
+        self._asr: Optional[AsrService] = None
+        self._tts: Optional[TtsService] = None
+        self._service_lock = threading.Lock()
         self.text_processor = LaoTextProcessor()
-        self.srs = SrsRepository(settings.sqlite_path)
+        # Drills repeat the same few phrases, so segmentation results are memoised in immutable form.
+        self._segment_cache = lru_cache(maxsize=1024)(self._segment_frozen)
+        self.srs = SrsRepository(db_path or settings.sqlite_path, flush_interval=settings.srs_flush_interval)
         self.state = TutorState()
         self._phrase_bank = self._load_phrase_bank()
+        # The bank is static after load; hand out read-only views instead of copies.
+        self._phrase_bank_view: Mapping[str, Mapping[str, str]] = MappingProxyType(
+            {task: MappingProxyType(phrases) for task, phrases in self._phrase_bank.items()}
+        )
+        self._first_phrase: Dict[str, Tuple[str, str]] = {
+            task: next(iter(phrases.items())) for task, phrases in self._phrase_bank.items() if phrases
+        }
+        # Resolved once per task switch rather than on every utterance.
+        self._current_bank = self.get_phrase_bank(self.state.current_task)
+        # A correct answer is always a phrase-bank entry, so warm the segmentation cache with them.
+        for phrases in self._phrase_bank.values():
+            for phrase in phrases:
+                self._segment_cache(phrase)
+
+    @property
+    def vad(self) -> VoiceActivityDetector:
+        if self._vad is None:
+            with self._service_lock:
+                if self._vad is None:
+                    settings = get_settings()
+                    self._vad = VoiceActivityDetector(
+                        sample_rate=settings.sample_rate,
+                        threshold=settings.vad_threshold,
+                        silence_floor_dbfs=settings.vad_silence_floor_dbfs,
+                    )
+        return self._vad
+
+    @property
+    def asr(self) -> AsrService:
+        if self._asr is None:
+            with self._service_lock:
+                if self._asr is None:
+                    self._asr = get_asr_service()
+        return self._asr
+
+    @property
+    def tts(self) -> TtsService:
+        if self._tts is None:
+            with self._service_lock:
+                if self._tts is None:
+                    self._tts = get_tts_service()
+        return self._tts
+
+    @property
+    def asr_ready(self) -> bool:
+        """Whether Whisper is loaded and usable, without triggering the load."""
+
+        return self._asr is not None and self._asr.is_ready
+
+    @property
+    def tts_ready(self) -> bool:
+        """Whether VITS is loaded and usable, without triggering the load."""
+
+        return self._tts is not None and self._tts.is_ready
+
+    @property
+    def vad_backend(self) -> str:
+        """Name of the active VAD backend, or ``"unloaded"`` before first use."""
+
+        return self._vad.backend_name if self._vad is not None else "unloaded"
+
+    def _segment_frozen(self, text: str) -> Tuple[Tuple[str, ...], str]:
+        segmented = self.text_processor.segment(text)
+        return tuple(segmented.tokens), segmented.romanised
+
+    def _segment(self, text: str) -> SegmentedText:
+        # A fresh SegmentedText per call, so no caller can mutate a cached result.
+        tokens, romanised = self._segment_cache(text)
+        return SegmentedText(tokens=list(tokens), romanised=romanised)
+
+    def preload(self) -> None:
+        """Load every lazily constructed service now, for deployments that prefer a warm start."""
+
+        _ = self.vad, self.asr, self.tts
 
     def _load_phrase_bank(self) -> Dict[str, Dict[str, str]]:
         # Minimal seed content; in real usage load from JSON/DB
@@ -54,8 +153,11 @@ class TutorEngine:
         }
 
     def process_audio(self, audio: np.ndarray, sample_rate: int, task_id: Optional[str] = None) -> SegmentFeedback:
-        if task_id:
+        if task_id and task_id != self.state.current_task:
             self.state.current_task = task_id
+            self._current_bank = self.get_phrase_bank(task_id)
+        # VAD and Whisper both consume contiguous float32; convert once here (a no-op when it already is).
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
         vad_result = self.vad.detect(audio, sample_rate)
         if not vad_result.has_speech:
             logger.debug("No speech detected (prob=%.2f)", vad_result.probability)
@@ -68,8 +170,8 @@ class TutorEngine:
             )
 
         asr_result = self.asr.transcribe(audio, sample_rate)
-        segmented = self.text_processor.segment(asr_result.text)
-        translation = self._phrase_bank.get(self.state.current_task, {}).get(asr_result.text)
+        segmented = self._segment(asr_result.text)
+        translation = self._current_bank.get(asr_result.text)
 
         corrections: List[str] = []
         praise: Optional[str] = None
@@ -98,8 +200,7 @@ class TutorEngine:
     ) -> Optional[TtsResult]:
         text = text_override or (feedback.lao_text if feedback else "")
         if not text:
-            bank = self._phrase_bank.get(self.state.current_task, {})
-            text = next(iter(bank.keys()), "")
+            text = self.get_focus_phrase()[0] or ""
         if not text:
             return None
         tts_result = self.tts.synthesize(text)
@@ -107,20 +208,14 @@ class TutorEngine:
             return None
         return tts_result
 
-    def get_phrase_bank(self, task_id: Optional[str] = None) -> Dict[str, str]:
-        if task_id:
-            return self._phrase_bank.get(task_id, {})
-        return self._phrase_bank.get(self.state.current_task, {})
+    def get_phrase_bank(self, task_id: Optional[str] = None) -> Mapping[str, str]:
+        return self._phrase_bank_view.get(task_id or self.state.current_task, _EMPTY_BANK)
 
     def get_focus_phrase(self, task_id: Optional[str] = None) -> tuple[Optional[str], Optional[str]]:
-        bank = self.get_phrase_bank(task_id)
-        if not bank:
-            return None, None
-        phrase, translation = next(iter(bank.items()))
-        return phrase, translation
-
-    def export_phrase_banks(self) -> Dict[str, Dict[str, str]]:
-        return {task: phrases.copy() for task, phrases in self._phrase_bank.items()}
+        return self._first_phrase.get(task_id or self.state.current_task, (None, None))
+
+    def export_phrase_banks(self) -> Mapping[str, Mapping[str, str]]:
+        return self._phrase_bank_view
 
 
 __all__ = ["TutorEngine", "TutorState"]
\ No newline at end of file
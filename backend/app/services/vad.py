@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Optional
+from math import gcd
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 
@@ -31,8 +33,34 @@ except Exception:  # pragma: no cover - optional dependency
     load_silero_vad = None  # type: ignore
     _SILERO_AVAILABLE = False
 
+try:  # pragma: no cover - optional dependency
+    from scipy.signal import firwin, resample_poly  # type: ignore
+
+    _SCIPY_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    firwin = None  # type: ignore
+    resample_poly = None  # type: ignore
+    _SCIPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Rates each backend consumes directly; anything else is resampled to the configured rate.
+_WEBRTC_RATES = frozenset({8000, 16000, 32000, 48000})
+_SILERO_RATES = frozenset({8000, 16000})
+
+# Anti-aliasing FIR taps per (up, down) ratio; clients send a handful of fixed rates.
+_RESAMPLE_FILTERS: Dict[Tuple[int, int], np.ndarray] = {}
+
+
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    taps = _RESAMPLE_FILTERS.get((up, down))
+    if taps is None:
+        # Same design resample_poly uses by default, computed once instead of per call.
+        max_rate = max(up, down)
+        taps = firwin(20 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+        _RESAMPLE_FILTERS[(up, down)] = taps
+    return taps
+
 
 @dataclass
 class VadResult:
@@ -46,11 +74,16 @@ class VadResult:
 class VoiceActivityDetector:
     """Wrapper around WebRTC / Silero VAD with an energy fallback."""
 
-    def __init__(self, sample_rate: int, threshold: float = 0.35) -> None:
+    def __init__(self, sample_rate: int, threshold: float = 0.35, silence_floor_dbfs: float = -50.0) -> None:
         self.sample_rate = sample_rate
         self.threshold = threshold
+        # Mean-square power of the loudest 20 ms frame below which a buffer is treated as silence.
+        self._silence_power = 10.0 ** (silence_floor_dbfs / 10.0)
         self._webrtc_vad: Optional["webrtcvad.Vad"] = None  # type: ignore[name-defined]
         self._silero_model: Optional[torch.nn.Module] = None  # type: ignore[attr-defined]
+        # detect() runs on several request threads at once, so scratch buffers are per thread.
+        self._scratch = threading.local()
+        self._silero_lock = threading.Lock()
 
         if _WEBRTCVAD_AVAILABLE:
             try:
@@ -78,64 +111,110 @@ class VoiceActivityDetector:
     def detect(self, audio: np.ndarray, sample_rate: Optional[int] = None) -> VadResult:
         """Determine whether the buffer contains speech."""
 
-        if audio.ndim != 1:
-            audio = np.mean(audio, axis=1)
+        if audio.ndim == 2:
+            # Sum in float32; np.mean would accumulate through a float64 temporary.
+            channels = audio.shape[1]
+            audio = audio.sum(axis=1, dtype=np.float32) * np.float32(1.0 / channels)
+        elif audio.ndim != 1:
+            raise ValueError(f"Expected mono or (samples, channels) audio, got shape {audio.shape}")
 
         sr = sample_rate or self.sample_rate
-        if sr != self.sample_rate:
+        if self._webrtc_vad is None and self._silero_model is None:
+            # Frame RMS does not depend on the sample rate, so skip resampling entirely.
+            return self._detect_with_energy(audio)
+
+        native_rates = _WEBRTC_RATES if self._webrtc_vad is not None else _SILERO_RATES
+        if sr != self.sample_rate and sr not in native_rates:
             audio = self._resample(audio, sr, self.sample_rate)
             sr = self.sample_rate
 
+        # Cheap pre-filter: pauses between turns never need the WebRTC/Silero pass.
+        if self._is_clearly_silent(audio, sr):
+            return VadResult(has_speech=False, probability=0.0, backend=self.backend_name)
         if self._webrtc_vad is not None:
             return self._detect_with_webrtc(audio, sr)
-        if self._silero_model is not None:
-            return self._detect_with_silero(audio, sr)
-        return self._detect_with_energy(audio)
+        return self._detect_with_silero(audio, sr)
+
+    def _is_clearly_silent(self, audio: np.ndarray, sample_rate: int) -> bool:
+        frame_size = sample_rate // 50
+        n_frames = audio.size // frame_size if frame_size > 0 else 0
+        if n_frames == 0:
+            return False
+        frames = audio[: n_frames * frame_size].reshape(n_frames, frame_size)
+        frame_power = np.einsum("ij,ij->i", frames, frames) / frame_size
+        return float(frame_power.max()) < self._silence_power
 
     def _detect_with_webrtc(self, audio: np.ndarray, sample_rate: int) -> VadResult:
-        frame_size = int(0.03 * sample_rate)
+        frame_size = sample_rate // 50  # 20 ms frames
         if frame_size <= 0:
             return VadResult(has_speech=False, probability=0.0, backend=self.backend_name)
         int_audio = self._to_int16(audio)
-        usable = (int_audio.size // frame_size) * frame_size
-        if usable == 0:
+        n_frames = int_audio.size // frame_size
+        if n_frames == 0:
             return VadResult(has_speech=False, probability=0.0, backend=self.backend_name)
-        frames = int_audio[:usable].reshape(-1, frame_size)
+        # Frames are zero-copy slices of one byte view rather than a bytes object per frame.
+        frame_bytes = frame_size * int_audio.itemsize
+        view = memoryview(int_audio).cast("B")
+        is_speech = self._webrtc_vad.is_speech  # type: ignore[union-attr]
         speech_frames = 0
-        for frame in frames:
-            try:
-                if self._webrtc_vad.is_speech(frame.tobytes(), sample_rate):  # type: ignore[union-attr]
+        try:
+            for offset in range(0, n_frames * frame_bytes, frame_bytes):
+                if is_speech(view[offset : offset + frame_bytes], sample_rate):
                     speech_frames += 1
-            except Exception as exc:  # pragma: no cover - defensive guard
-                logger.debug("WebRTC VAD frame error: %s", exc)
-        probability = speech_frames / max(len(frames), 1)
+        except Exception as exc:  # pragma: no cover - defensive guard
+            logger.debug("WebRTC VAD frame error: %s", exc)
+        probability = speech_frames / n_frames
         has_speech = probability >= self.threshold
         return VadResult(has_speech=has_speech, probability=probability, backend=self.backend_name)
 
     def _detect_with_silero(self, audio: np.ndarray, sample_rate: int) -> VadResult:
-        tensor = torch.from_numpy(audio).float()  # type: ignore[attr-defined]
+        tensor = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))  # type: ignore[attr-defined]
         tensor = tensor.unsqueeze(0)
-        with torch.no_grad():  # type: ignore[attr-defined]
-            prob = float(self._silero_model(tensor, sample_rate).item())  # type: ignore[operator]
+        # Silero keeps recurrent state inside the model, so concurrent requests must take turns.
+        with self._silero_lock, torch.inference_mode():  # type: ignore[attr-defined]
+            if hasattr(self._silero_model, "audio_forward"):
+                # Current Silero releases only accept one 32 ms window per forward; this scores them all at once.
+                probs = self._silero_model.audio_forward(tensor, sample_rate)  # type: ignore[union-attr]
+                prob = float(probs.max().item()) if probs.numel() else 0.0
+            else:
+                prob = float(self._silero_model(tensor, sample_rate).item())  # type: ignore[operator]
         has_speech = prob >= self.threshold
         return VadResult(has_speech=has_speech, probability=prob, backend=self.backend_name)
 
     def _detect_with_energy(self, audio: np.ndarray) -> VadResult:
-        rms = float(np.sqrt(np.mean(np.square(audio))))
+        # A dot product is one pass with no temporary (and releases the GIL), unlike square+mean.
+        rms = float(np.sqrt(np.dot(audio, audio) / audio.size)) if audio.size else 0.0
         reference = 0.03
         probability = float(np.clip(rms / reference, 0.0, 1.0))
         has_speech = probability >= self.threshold
         return VadResult(has_speech=has_speech, probability=probability, backend=self.backend_name)
 
-    @staticmethod
-    def _to_int16(audio: np.ndarray) -> np.ndarray:
-        audio_clipped = np.clip(audio, -1.0, 1.0)
-        return (audio_clipped * 32767).astype(np.int16)
+    def _to_int16(self, audio: np.ndarray) -> np.ndarray:
+        """Convert to int16 in per-thread scratch buffers; the result is only valid until the next call."""
+
+        scratch = self._scratch
+        size = audio.size
+        if getattr(scratch, "f32", None) is None or scratch.f32.size < size:
+            scratch.f32 = np.empty(size, dtype=np.float32)
+            scratch.i16 = np.empty(size, dtype=np.int16)
+        buf = scratch.f32[:size]
+        np.multiply(audio, 32767.0, out=buf, casting="same_kind")
+        np.maximum(buf, -32767.0, out=buf)
+        np.minimum(buf, 32767.0, out=buf)
+        out = scratch.i16[:size]
+        np.copyto(out, buf, casting="unsafe")
+        return out
 
     @staticmethod
     def _resample(audio: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
         if from_rate == to_rate or audio.size == 0:
             return audio.astype(np.float32)
+        if _SCIPY_AVAILABLE:
+            divisor = gcd(from_rate, to_rate)
+            up, down = to_rate // divisor, from_rate // divisor
+            return resample_poly(
+                audio.astype(np.float32, copy=False), up, down, window=_resample_filter(up, down)
+            ).astype(np.float32, copy=False)
         duration = audio.size / float(from_rate)
         target_length = int(duration * to_rate)
         if target_length <= 0:
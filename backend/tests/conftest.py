@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+# The app builds its SRS database at import time; keep the test run's copy out of the working tree.
+os.environ.setdefault("LAO_TUTOR_SQLITE_PATH", os.path.join(tempfile.mkdtemp(prefix="lao-tutor-"), "tutor.db"))
+
+from backend.app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,27 @@
+import base64
+
+import numpy as np
+import pytest
+
+from backend.app.services.audio_codec import decode_pcm_base64
+
+
+def test_decodes_pcm16_to_scaled_float32():
+    pcm = np.array([0, 16384, -32768, 32767], dtype="<i2").tobytes()
+
+    audio = decode_pcm_base64(base64.b64encode(pcm).decode("ascii"))
+
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0, 32767 / 32768])
+
+
+def test_rejects_empty_and_invalid_payloads():
+    with pytest.raises(ValueError):
+        decode_pcm_base64("")
+    with pytest.raises(ValueError):
+        decode_pcm_base64("not base64!")
+
+
+def test_rejects_odd_length_payload():
+    with pytest.raises(ValueError, match="even byte length"):
+        decode_pcm_base64(base64.b64encode(b"\x00\x01\x02").decode("ascii"))
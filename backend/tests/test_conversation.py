@@ -0,0 +1,65 @@
+import base64
+
+
+def test_conversation_endpoint_returns_reply(client):
+    response = client.post(
+        "/api/v1/conversation",
+        json={"message": "Hello", "history": []},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["reply"]["role"] == "assistant"
+    assert payload["reply"]["content"]
+    assert isinstance(payload["history"], list)
+    assert payload["history"], "History should include the new turn"
+    assert "heard_text" in payload
+    assert "spoken_text" in payload
+    assert payload["utterance_feedback"] is None
+
+
+def test_conversation_rejects_empty_payload(client):
+    response = client.post("/api/v1/conversation", json={"history": []})
+    assert response.status_code == 422
+
+
+def test_conversation_accepts_audio_only(client):
+    silence = bytes(32)  # 16 zero PCM16 samples
+    payload = {
+        "audio_base64": base64.b64encode(silence).decode("utf-8"),
+        "sample_rate": 16000,
+        "history": [],
+    }
+    response = client.post("/api/v1/conversation", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reply"]["role"] == "assistant"
+    assert body["utterance_feedback"] is not None
+    assert "spoken_text" in body
+
+
+def test_conversation_accepts_message_and_audio_together(client):
+    silence = bytes(32)  # 16 zero PCM16 samples
+    payload = {
+        "message": "Hello",
+        "audio_base64": base64.b64encode(silence).decode("utf-8"),
+        "sample_rate": 16000,
+        "history": [],
+    }
+    response = client.post("/api/v1/conversation", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reply"]["role"] == "assistant"
+    assert body["reply"]["content"]
+    assert body["utterance_feedback"] is not None
+    assert body["history"][-2] == {"role": "user", "content": "Hello"}
+
+
+def test_conversation_rejects_odd_length_audio(client):
+    payload = {
+        "audio_base64": base64.b64encode(bytes(3)).decode("utf-8"),
+        "sample_rate": 16000,
+        "history": [],
+    }
+    response = client.post("/api/v1/conversation", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "PCM16 payload must have an even byte length"
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from backend.app.services.llm import _LINE_ANCHOR, ConversationService
+
+
+def _turns(count):
+    return [
+        {"role": "user" if idx % 2 == 0 else "assistant", "content": f"turn-{idx}"}
+        for idx in range(count)
+    ]
+
+
+def test_generate_returns_bounded_history():
+    service = ConversationService()
+
+    result = asyncio.run(service.generate(_turns(12), "Hello"))
+
+    history = list(result.history)
+    assert len(history) == 10
+    assert history[0]["content"] == "turn-4"
+    assert history[-2] == {"role": "user", "content": "Hello"}
+    assert history[-1] == {"role": "assistant", "content": result.reply_text}
+
+
+def test_prompt_keeps_only_recent_turns():
+    service = ConversationService()
+    service._per_line_ids = True
+    service._encode_line = lambda text: (text,)
+
+    prompt = service._build_prompt_ids(_turns(12), "Hello", None, None)
+
+    turn_lines = [line for line in prompt if line.startswith(("User: turn", "Assistant: turn"))]
+    assert turn_lines == [f"{'User' if idx % 2 == 0 else 'Assistant'}: turn-{idx}" for idx in range(4, 12)]
+    assert prompt[-2:] == ["User: Hello", "Assistant:"]
+
+
+def _llama_style_tokenizer():
+    tokenizers = pytest.importorskip("tokenizers")
+    transformers = pytest.importorskip("transformers")
+    # Same layout as the Llama tokenizer.json: "▁" prepended once, spaces as "▁", byte fallback.
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.BPE(byte_fallback=True, unk_token="<unk>"))
+    tokenizer.normalizer = tokenizers.normalizers.Sequence(
+        [tokenizers.normalizers.Prepend("▁"), tokenizers.normalizers.Replace(" ", "▁")]
+    )
+    specials = ["<unk>", "<s>", "</s>"] + [f"<0x{byte:02X}>" for byte in range(256)]
+    corpus = [f"System: {ConversationService._SYSTEM_PROMPT} User: Hello Assistant: ສະບາຍດີ ຂອບໃຈ ສອງ"] * 20
+    tokenizer.train_from_iterator(corpus, tokenizers.trainers.BpeTrainer(vocab_size=400, special_tokens=specials))
+    tokenizer.post_processor = tokenizers.processors.TemplateProcessing(
+        single="<s> $A", special_tokens=[("<s>", tokenizer.token_to_id("<s>"))]
+    )
+    return transformers.PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, bos_token="<s>", eos_token="</s>", unk_token="<unk>"
+    )
+
+
+def test_per_line_prompt_ids_match_joined_prompt():
+    tokenizer = _llama_style_tokenizer()
+    service = ConversationService({"day1_greetings": {"ສະບາຍດີ": "Hello"}})
+    service._tokenizer = tokenizer
+    service._system_ids = (tokenizer.bos_token_id,) + tuple(
+        tokenizer(f"System: {service._SYSTEM_PROMPT}", add_special_tokens=False).input_ids
+    )
+    service._anchor_len = len(tokenizer(_LINE_ANCHOR, add_special_tokens=False).input_ids)
+
+    assert service._line_ids_match_joined()
+    service._per_line_ids = True
+    history = _turns(3) + [{"role": "assistant", "content": "ສະບາຍດີ  \nagain"}]
+    prompt = service._build_prompt_ids(history, "Hello", "ສະບາຍດີ", "Hello")
+
+    joined = "\n".join(service._prompt_lines(history, "Hello", "ສະບາຍດີ", "Hello"))
+    assert prompt == tokenizer(joined).input_ids
+
+
+def test_extract_lao_line_returns_first_lao_line():
+    reply = "Great effort!\r\n  Repeat after me: ສະບາຍດີ (sabaidee)  \r\nThen try ຂອບໃຈ."
+
+    assert ConversationService._extract_lao_line(reply) == "Repeat after me: ສະບາຍດີ (sabaidee)"
+    assert ConversationService._extract_lao_line("No Lao here.\nStill none.") is None
+
+
+def test_focus_phrase_falls_back_to_first_bank():
+    service = ConversationService({"greetings": {"ສະບາຍດີ": "Hello"}, "numbers": {"ສອງ": "2"}, "empty": {}})
+
+    assert service._select_focus_phrase("numbers") == ("ສອງ", "2")
+    assert service._select_focus_phrase("unknown") == ("ສະບາຍດີ", "Hello")
+    assert service._select_focus_phrase("empty") == (None, None)
+    assert ConversationService()._select_focus_phrase(None) == (None, None)
@@ -0,0 +1,96 @@
+import gc
+import sqlite3
+import weakref
+
+from backend.app.services.srs import SCHEMA_SQL, SrsRepository, _flush_live_repositories
+
+
+def test_legacy_text_schema_is_migrated_to_epoch_seconds(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA_SQL.replace("next_due INTEGER", "next_due TEXT"))
+        conn.executemany(
+            "INSERT INTO reviews(card_id, reviewed_at, ease, interval, next_due) VALUES(?, ?, ?, ?, ?)",
+            [
+                ("old_past", "2020-01-01T00:00:00", 1.0, 1, "2020-01-02T00:00:00.250000"),
+                ("old_future", "2020-01-01T00:00:00", 1.0, 1, "2999-01-01T00:00:00"),
+            ],
+        )
+
+    repo = SrsRepository(db_path, flush_interval=0)
+
+    assert list(repo.due_cards()) == ["old_past"]
+    with sqlite3.connect(db_path) as conn:
+        column_types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(reviews)")}
+        stored = conn.execute("SELECT DISTINCT typeof(next_due) FROM reviews").fetchall()
+    assert column_types["next_due"] == "INTEGER"
+    assert stored == [("integer",)]
+
+
+def _stored_count(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+
+def test_buffered_reviews_are_visible_to_due_cards_before_timer(tmp_path):
+    db_path = tmp_path / "buffered.db"
+    repo = SrsRepository(db_path, flush_interval=60)
+
+    repo.log_review("ສະບາຍດີ", ease=1.0, prev_interval=0)
+    assert _stored_count(db_path) == 0
+
+    # A one-day interval is never due immediately, but the read must still flush the buffer.
+    assert list(repo.due_cards()) == []
+    assert _stored_count(db_path) == 1
+
+
+def test_zero_interval_writes_through(tmp_path):
+    db_path = tmp_path / "write_through.db"
+    repo = SrsRepository(db_path, flush_interval=0)
+
+    repo.log_review("ຂອບໃຈ", ease=1.0)
+
+    assert _stored_count(db_path) == 1
+
+
+def test_max_pending_triggers_flush(tmp_path):
+    db_path = tmp_path / "max_pending.db"
+    repo = SrsRepository(db_path, flush_interval=60, max_pending=3)
+
+    for idx in range(2):
+        repo.log_review(f"card-{idx}", ease=1.0)
+    assert _stored_count(db_path) == 0
+
+    repo.log_review("card-2", ease=1.0)
+    assert _stored_count(db_path) == 3
+
+
+def test_failed_flush_keeps_rows_pending(tmp_path):
+    db_path = tmp_path / "locked.db"
+    repo = SrsRepository(db_path, flush_interval=60)
+    repo.log_review("ສອງ", ease=1.0)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE reviews")
+    repo.flush()
+
+    repo._ensure_schema()
+    repo.flush()
+    assert _stored_count(db_path) == 1
+
+
+def test_exit_hook_flushes_without_keeping_repositories_alive(tmp_path):
+    db_path = tmp_path / "exit.db"
+    repo = SrsRepository(db_path, flush_interval=60)
+    repo.log_review("ສາມ", ease=1.0)
+    timer = repo._flush_timer
+
+    _flush_live_repositories()
+    assert _stored_count(db_path) == 1
+    timer.join()  # the cancelled timer thread references the repository until it exits
+    del timer
+
+    ref = weakref.ref(repo)
+    del repo
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,19 @@
+import numpy as np
+
+from backend.app.services.tts import TtsService, _float_to_pcm16
+
+
+def test_float_to_pcm16_scales_and_clips():
+    audio = np.array([0.0, 0.5, -1.0, 1.5, -2.0], dtype=np.float32)
+
+    pcm = _float_to_pcm16(audio)
+
+    assert pcm.dtype == np.dtype("<i2")
+    assert pcm.tolist() == [0, 16383, -32767, 32767, -32768]
+
+
+def test_synthesize_batch_returns_placeholder_per_text_without_model():
+    service = TtsService()
+
+    assert service.synthesize_batch(["ສະບາຍດີ", "ຂອບໃຈ"]) == [None, None]
+    assert service.synthesize("ສະບາຍດີ") is None
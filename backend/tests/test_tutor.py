@@ -0,0 +1,48 @@
+import pytest
+
+from backend.app.services.tutor import TutorEngine
+
+
+def test_phrase_banks_are_shared_read_only_views(tmp_path):
+    engine = TutorEngine(db_path=tmp_path / "tutor.db")
+
+    banks = engine.export_phrase_banks()
+    assert banks is engine.export_phrase_banks()
+    assert banks["day1_greetings"]["ສະບາຍດີ"] == "Hello"
+    with pytest.raises(TypeError):
+        banks["day1_greetings"]["ສະບາຍດີ"] = "Goodbye"  # type: ignore[index]
+
+    assert engine.get_phrase_bank("numbers_0_10")["ສອງ"] == "2"
+    assert dict(engine.get_phrase_bank("missing_task")) == {}
+
+
+def test_services_load_lazily_until_preload(tmp_path):
+    engine = TutorEngine(db_path=tmp_path / "tutor.db")
+
+    engine.get_focus_phrase()
+    assert engine._vad is None and engine._asr is None and engine._tts is None
+
+    engine.preload()
+    assert engine._vad is engine.vad
+    assert engine._asr is engine.asr
+    assert engine._tts is engine.tts
+
+
+def test_focus_phrase_is_first_entry_of_task(tmp_path):
+    engine = TutorEngine(db_path=tmp_path / "tutor.db")
+
+    assert engine.get_focus_phrase("numbers_0_10") == ("ສູນ", "0")
+    assert engine.get_focus_phrase() == ("ສະບາຍດີ", "Hello")
+    assert engine.get_focus_phrase("missing_task") == (None, None)
+
+
+def test_cached_segmentation_is_not_shared_between_callers(tmp_path):
+    engine = TutorEngine(db_path=tmp_path / "tutor.db")
+
+    first = engine._segment("ສະບາຍດີ")
+    first.tokens.append("mutated")
+    second = engine._segment("ສະບາຍດີ")
+
+    assert "mutated" not in second.tokens
+    assert second.romanised == first.romanised
+    assert engine._segment_cache.cache_info().hits >= 1
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from backend.app.services import vad
+from backend.app.services.vad import VoiceActivityDetector
+
+
+def test_resample_matches_target_length_and_dtype():
+    tone = np.sin(np.arange(4410) / 44100 * 2 * np.pi * 440).astype(np.float32)
+
+    resampled = VoiceActivityDetector._resample(tone, 44100, 16000)
+
+    assert resampled.dtype == np.float32
+    assert resampled.shape == (1600,)
+    assert np.abs(resampled).max() < 1.1
+
+
+def test_resample_poly_keeps_low_tone_and_caches_filter():
+    pytest.importorskip("scipy")
+
+    tone = np.sin(np.arange(48000) / 48000 * 2 * np.pi * 200).astype(np.float32)
+
+    resampled = VoiceActivityDetector._resample(tone, 48000, 16000)
+
+    assert resampled.dtype == np.float32
+    assert resampled.shape == (16000,)
+    # Skip the filter's edge transient; a 200 Hz tone is well inside the 8 kHz passband.
+    assert 0.9 < np.abs(resampled[1000:-1000]).max() < 1.1
+    taps = vad._RESAMPLE_FILTERS[(1, 3)]
+    VoiceActivityDetector._resample(tone, 48000, 16000)
+    assert vad._RESAMPLE_FILTERS[(1, 3)] is taps
+
+
+def test_to_int16_scales_clips_and_reuses_scratch():
+    detector = VoiceActivityDetector(sample_rate=16000)
+    audio = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 2.0, -2.0], dtype=np.float32)
+
+    first = detector._to_int16(audio)
+
+    expected = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    assert first.dtype == np.int16
+    np.testing.assert_array_equal(first, expected)
+    second = detector._to_int16(audio[:3])
+    assert np.shares_memory(first, second)
+
+
+def test_energy_fallback_separates_silence_from_loud_audio():
+    detector = VoiceActivityDetector(sample_rate=16000)
+
+    silent = detector._detect_with_energy(np.zeros(1600, dtype=np.float32))
+    loud = detector._detect_with_energy(np.full(1600, 0.1, dtype=np.float32))
+
+    assert not silent.has_speech and silent.probability == 0.0
+    assert loud.has_speech and loud.probability == 1.0
+    assert detector._detect_with_energy(np.zeros(0, dtype=np.float32)).probability == 0.0
+
+
+def test_silence_prefilter_uses_loudest_frame():
+    detector = VoiceActivityDetector(sample_rate=16000, silence_floor_dbfs=-50.0)
+    quiet = np.full(16000, 0.001, dtype=np.float32)  # -60 dBFS
+    burst = quiet.copy()
+    burst[8000:8320] = 0.1  # one 20 ms frame at -20 dBFS
+
+    assert detector._is_clearly_silent(quiet, 16000)
+    assert not detector._is_clearly_silent(burst, 16000)
+    assert not detector._is_clearly_silent(quiet[:100], 16000)
+
+
+def test_detect_downmixes_stereo_in_float32():
+    detector = VoiceActivityDetector(sample_rate=16000)
+    stereo = np.zeros((1600, 2), dtype=np.float32)
+    stereo[:, 0] = 0.2
+
+    result = detector.detect(stereo, 16000)
+
+    assert result.has_speech
+    with pytest.raises(ValueError):
+        detector.detect(np.zeros((10, 2, 2), dtype=np.float32), 16000)
+
+
+class _RecordingVad:
+    def __init__(self):
+        self.calls = []
+
+    def is_speech(self, frame, sample_rate):
+        self.calls.append((len(frame), sample_rate))
+        return True
+
+
+def test_webrtc_consumes_native_rates_without_resampling(monkeypatch):
+    detector = VoiceActivityDetector(sample_rate=16000)
+    detector._webrtc_vad = _RecordingVad()
+    monkeypatch.setattr(VoiceActivityDetector, "_resample", staticmethod(lambda *args: pytest.fail("resampled")))
+
+    result = detector.detect(np.full(4800, 0.1, dtype=np.float32), 48000)
+
+    assert result.has_speech
+    assert detector._webrtc_vad.calls == [(1920, 48000)] * 5